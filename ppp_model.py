@@ -7,53 +7,233 @@ Purchasing Power Parity theory. It compares the actual exchange rate with
 the PPP-implied exchange rate derived from price level indices.
 """
 
-def calculate_ppp(domestic_price, foreign_price, current_exchange_rate):
+import argparse
+import sys
+from functools import lru_cache
+from typing import Final, NamedTuple
+
+import numpy as np
+
+
+class PPPResult(NamedTuple):
+    """PPP-implied exchange rate and misalignment percentage.
+    
+    Fields hold floats for scalar inputs and ndarrays for array inputs.
+    """
+    ppp_implied_rate: float
+    misalignment_percent: float
+
+
+def _ppp_kernel(domestic_price, foreign_price, current_exchange_rate):
+    """Scalar PPP kernel returning a PPPResult."""
+    # PPP-implied exchange rate = domestic_price / foreign_price
+    ppp_implied_rate = domestic_price / foreign_price
+    
+    # Percentage misalignment = (current - ppp) / ppp * 100%
+    misalignment_pct = ((current_exchange_rate - ppp_implied_rate) / ppp_implied_rate) * 100.0
+    
+    return PPPResult(ppp_implied_rate, misalignment_pct)
+
+
+# Scenario loops often repeat the same price levels across many FX updates.
+# calculate_ppp keeps NaN inputs out of this cache (see there). typed=True keeps
+# equal values of different types (120.5, np.float32(120.5), Fraction(241, 2))
+# apart, so each call gets the result for its own input types.
+_ppp_cached = lru_cache(maxsize=4096, typed=True)(_ppp_kernel)
+
+# Compiled on first use by _get_ppp_batch_kernel; False if Numba is missing.
+# The loop is opt-in (calculate_ppp(..., use_numba=True)) because the first call
+# pays ~0.3s to import Numba (~0.5s with a cold compile cache), which only a long
+# run of large batches recovers (it saves ~2.5ns per element over NumPy). Unlike
+# the NumPy path it does not emit RuntimeWarning on division by zero.
+_ppp_batch_kernel = None
+
+
+def _ppp_batch_loop(domestic_price, foreign_price, current_exchange_rate,
+                    ppp_implied_rate, misalignment_pct):
+    """Single-pass PPP loop over 1-D float64 arrays, filling the two output arrays."""
+    for i in range(domestic_price.shape[0]):
+        ppp = domestic_price[i] / foreign_price[i]
+        ppp_implied_rate[i] = ppp
+        misalignment_pct[i] = (current_exchange_rate[i] - ppp) / ppp * 100.0
+
+
+def _get_ppp_batch_kernel():
+    """Return the Numba-compiled batch loop, or None if Numba is not installed."""
+    global _ppp_batch_kernel
+    if _ppp_batch_kernel is None:
+        # Imported lazily so plain scalar use does not pay Numba's import cost
+        try:
+            from numba import njit
+        except ImportError:
+            _ppp_batch_kernel = False
+        else:
+            # error_model="numpy" gives inf/nan on division by zero like the ufunc path;
+            # "arcp" lets LLVM lower the divisions to reciprocal multiplies, so results
+            # may differ from the NumPy path in the last bit
+            _ppp_batch_kernel = njit(cache=True, error_model="numpy",
+                                     fastmath={"arcp"})(_ppp_batch_loop)
+    return _ppp_batch_kernel or None
+
+
+def calculate_ppp(domestic_price, foreign_price, current_exchange_rate, *, use_numba=False):
     """
     Calculate currency misalignment based on PPP theory.
     
+    Scalar inputs return Python floats. Array-like inputs are broadcast
+    against each other and evaluated elementwise, so many currency pairs
+    can be analyzed in a single call.
+    
     Parameters:
-    domestic_price (float): Price level index in domestic country (e.g., CPI).
-    foreign_price (float): Price level index in foreign country.
-    current_exchange_rate (float): Current spot exchange rate (domestic/foreign).
+    domestic_price (float or array_like): Price level index in domestic country (e.g., CPI).
+    foreign_price (float or array_like): Price level index in foreign country.
+    current_exchange_rate (float or array_like): Current spot exchange rate (domestic/foreign).
+    use_numba (bool): Evaluate same-shape 1-D arrays with a compiled loop when Numba
+                      is installed. Faster for large batches after a one-off startup
+                      cost, but silent on division by zero and may differ from
+                      the NumPy path in the last bit.
     
     Returns:
-    dict: Contains PPP-implied exchange rate and misalignment percentage.
+    PPPResult: Contains PPP-implied exchange rate and misalignment percentage.
            Positive misalignment means the domestic currency is overvalued.
+    
+    Example:
+    >>> type(calculate_ppp(np.float32(120.5), np.float32(100.0), np.float32(1.5))[1]).__name__
+    'float32'
+    >>> calculate_ppp(120.5, 100.0, 1.5)
+    PPPResult(ppp_implied_rate=1.205, misalignment_percent=24.48132780082987)
+    >>> bool(np.isnan(calculate_ppp(np.float64(1.0), np.float64(0.0), np.float64(1.0))[1]))
+    True
+    >>> calculate_ppp(1.0, 0.0, 1.0)
+    Traceback (most recent call last):
+    ...
+    ZeroDivisionError: float division by zero
     """
-    # PPP-implied exchange rate = domestic_price / foreign_price
-    ppp_implied_rate = domestic_price / foreign_price
+    # Cheap isinstance checks keep plain-number calls fast; np.isscalar
+    # only runs for other scalar types (e.g. np.int64) and for arrays
+    if ((isinstance(domestic_price, (int, float))
+            and isinstance(foreign_price, (int, float))
+            and isinstance(current_exchange_rate, (int, float)))
+            or (np.isscalar(domestic_price) and np.isscalar(foreign_price)
+                and np.isscalar(current_exchange_rate))):
+        # Each NaN object hashes by id, so caching NaN inputs would only add
+        # entries that evict useful ones; compute those directly instead
+        if (domestic_price != domestic_price or foreign_price != foreign_price
+                or current_exchange_rate != current_exchange_rate):
+            return _ppp_kernel(domestic_price, foreign_price, current_exchange_rate)
+        # Cache hits return the stored PPPResult without building a new one
+        return _ppp_cached(domestic_price, foreign_price, current_exchange_rate)
     
-    # Percentage misalignment = (current - ppp) / ppp * 100%
-    misalignment_pct = ((current_exchange_rate - ppp_implied_rate) / ppp_implied_rate) * 100.0
+    domestic_price = np.asarray(domestic_price, dtype=np.float64)
+    foreign_price = np.asarray(foreign_price, dtype=np.float64)
+    current_exchange_rate = np.asarray(current_exchange_rate, dtype=np.float64)
+    
+    # Same-shape 1-D batches can run as one fused compiled loop
+    if (use_numba and domestic_price.ndim == 1
+            and domestic_price.shape == foreign_price.shape == current_exchange_rate.shape):
+        kernel = _get_ppp_batch_kernel()
+        if kernel is not None:
+            ppp_implied_rate = np.empty_like(domestic_price)
+            misalignment_pct = np.empty_like(domestic_price)
+            kernel(domestic_price, foreign_price, current_exchange_rate,
+                   ppp_implied_rate, misalignment_pct)
+            return PPPResult(ppp_implied_rate, misalignment_pct)
     
-    return {
-        "ppp_implied_rate": ppp_implied_rate,
-        "misalignment_percent": misalignment_pct
-    }
+    ppp_implied_rate = np.divide(domestic_price, foreign_price)
+    
+    # Same formula as the scalar path, updated in place to avoid temporaries
+    misalignment_pct = np.subtract(current_exchange_rate, ppp_implied_rate)
+    misalignment_pct /= ppp_implied_rate
+    misalignment_pct *= 100.0
+    
+    return PPPResult(ppp_implied_rate, misalignment_pct)
 
 
-def main():
-    """Example usage of the PPP model."""
-    # Example data: US (domestic) vs Eurozone (foreign)
-    # Price levels (CPI indices relative to base year)
-    us_cpi = 120.5          # US price level index
-    eu_cpi = 115.2          # Eurozone price level index
-    current_eur_usd = 1.08  # EUR/USD exchange rate (USD per EUR)
+def analyze_panel(price_levels, exchange_rates):
+    """
+    Calculate PPP misalignment for every pair in a basket of currencies.
     
-    result = calculate_ppp(us_cpi, eu_cpi, current_eur_usd)
+    Parameters:
+    price_levels (array_like): 1-D array of N price level indices, one per country.
+    exchange_rates (array_like): N x N matrix where entry [i, j] is the spot rate
+                                 quoted as units of currency i per unit of currency j.
+    
+    Returns:
+    PPPResult: N x N arrays where entry [i, j] treats country i as domestic
+               and country j as foreign.
+    
+    Raises:
+    ValueError: If price_levels is not 1-D or exchange_rates is not N x N.
+    
+    Example:
+    >>> result = analyze_panel([120.0, 100.0], [[1.0, 1.5], [1 / 1.5, 1.0]])
+    >>> result.ppp_implied_rate.round(4)
+    array([[1.    , 1.2   ],
+           [0.8333, 1.    ]])
+    >>> result.misalignment_percent.round(4)
+    array([[  0.,  25.],
+           [-20.,   0.]])
+    """
+    price_levels = np.asarray(price_levels, dtype=np.float64)
+    exchange_rates = np.asarray(exchange_rates, dtype=np.float64)
     
-    print("=== PPP Currency Misalignment Analysis ===")
-    print(f"Domestic (US) price level index: {us_cpi}")
-    print(f"Foreign (EU) price level index: {eu_cpi}")
-    print(f"Current exchange rate (USD/EUR): {current_eur_usd}")
-    print(f"PPP-implied exchange rate (USD/EUR): {result['ppp_implied_rate']:.4f}")
-    print(f"Misalignment: {result['misalignment_percent']:.2f}%")
+    # A length-N vector would broadcast silently against the N x N PPP matrix
+    if price_levels.ndim != 1:
+        raise ValueError(f"price_levels must be 1-D, got shape {price_levels.shape}")
+    if exchange_rates.shape != (len(price_levels),) * 2:
+        raise ValueError(f"exchange_rates must have shape {(len(price_levels),) * 2}, "
+                         f"got {exchange_rates.shape}")
     
-    if result['misalignment_percent'] > 0:
-        print("Interpretation: Domestic currency (USD) is OVERVALUED relative to PPP.")
+    # Broadcast a column against a row so all N*N pairs are evaluated in one call
+    return calculate_ppp(price_levels[:, None], price_levels[None, :], exchange_rates)
+
+
+# Example data: US (domestic) vs Eurozone (foreign)
+# Price levels (CPI indices relative to base year)
+US_CPI: Final[float] = 120.5          # US price level index
+EU_CPI: Final[float] = 115.2          # Eurozone price level index
+CURRENT_EUR_USD: Final[float] = 1.08  # EUR/USD exchange rate (USD per EUR)
+
+
+_REPORT_TEMPLATE: Final[str] = (
+    "=== PPP Currency Misalignment Analysis ===\n"
+    "Domestic (US) price level index: %s\n"
+    "Foreign (EU) price level index: %s\n"
+    "Current exchange rate (USD/EUR): %s\n"
+    "PPP-implied exchange rate (USD/EUR): %.4f\n"
+    "Misalignment: %.2f%%\n"
+    "Interpretation: Domestic currency (USD) is %s relative to PPP.\n"
+)
+
+
+def main(argv=()):
+    """
+    Example usage of the PPP model. Returns the PPPResult for programmatic callers.
+    
+    argv defaults to no arguments rather than sys.argv, so library callers inside
+    another command-line program (pytest, Jupyter) are not affected by its flags.
+    """
+    parser = argparse.ArgumentParser(description="PPP currency misalignment analysis.")
+    parser.add_argument("--quiet", action="store_true",
+                        help="compute the result without printing the report")
+    args = parser.parse_args(list(argv))
+    
+    result = calculate_ppp(US_CPI, EU_CPI, CURRENT_EUR_USD)
+    if args.quiet:
+        return result
+    
+    if result.misalignment_percent > 0:
+        valuation = "OVERVALUED"
     else:
-        print("Interpretation: Domestic currency (USD) is UNDERVALUED relative to PPP.")
+        valuation = "UNDERVALUED"
+    
+    # Emit the whole report with a single format and a single write
+    sys.stdout.write(_REPORT_TEMPLATE % (
+        US_CPI, EU_CPI, CURRENT_EUR_USD,
+        result.ppp_implied_rate, result.misalignment_percent, valuation,
+    ))
+    return result
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])